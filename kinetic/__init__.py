@@ -12,9 +12,12 @@ Made by perpetualCreations
 """
 
 import socket
-from typing import Union, Callable
+from functools import partial, lru_cache
+from typing import Union, Callable, Tuple
 from sys import exit as stop
 from subprocess import call
+from shlex import split
+from shutil import which
 import swbs
 from kinetic import actiongroups as ActionGroups  # noqa: F401
 from kinetic import components as Components  # noqa: F401
@@ -22,8 +25,105 @@ from kinetic import controllers as Controllers  # noqa: F401
 from kinetic import exceptions as Exceptions  # noqa: F401
 
 
+def _spawn(command: str) -> int:
+    """
+    Run command without a shell and wait for it to exit.
+
+    The executable is resolved to an absolute path, which lets subprocess \
+        launch it with posix_spawn where the platform supports it. File \
+            descriptors are closed in the child, so it cannot keep the \
+                agent's sockets open.
+
+    Raises ValueError if command is empty.
+
+    :param command: command line, split into arguments with shlex
+    :type command: str
+    :return: exit status of command
+    :rtype: int
+    """
+    arguments = split(command)
+    if not arguments:
+        raise ValueError("Command is empty.")
+    arguments[0] = which(arguments[0]) or arguments[0]
+    return call(arguments)
+
+
+@lru_cache(maxsize=None)
+def _resolve(host: str) -> str:
+    """
+    Resolve hostname to an IPv4 address, cached so reconnects skip \
+        repeated DNS or mDNS lookups.
+
+    Failed lookups raise socket.gaierror and are not cached. Callers clear \
+        the cache with _resolve.cache_clear() when connecting to a resolved \
+            address fails, as the address may have changed.
+
+    :param host: hostname or address
+    :type host: str
+    :return: IPv4 address
+    :rtype: str
+    """
+    return socket.gethostbyname(host)
+
+
+def _signal_controller(network: swbs.Host,
+                       signal: bytes) -> Union[str, None]:
+    """
+    Handle handshake signal CONTROLLER, the sender is the controller.
+
+    :param network: host instance that received the signal
+    :type network: swbs.Host
+    :param signal: received handshake signal
+    :type signal: bytes
+    :return: controller address, None if signal is malformed
+    :rtype: Union[str, None]
+    """
+    if signal == b"CONTROLLER":
+        return network.client_address[0]
+    return None
+
+
+def _signal_point(_network: swbs.Host, signal: bytes) -> Union[str, None]:
+    """
+    Handle handshake signal POINT <HOSTNAME>, the sender points to the \
+        controller.
+
+    :param _network: host instance that received the signal, unused
+    :type _network: swbs.Host
+    :param signal: received handshake signal
+    :type signal: bytes
+    :return: controller hostname, None if signal is malformed
+    :rtype: Union[str, None]
+    """
+    if signal.startswith(b"POINT "):
+        return signal[6:].decode("utf-8", "replace") or None
+    return None
+
+
+# fixed replies, pre-encoded so swbs sends them without encoding each time
+_OK = b"OK"
+_KEYERROR = b"KEYERROR"
+_HELP = b"HELP"
+_KINETIC = b"KINETIC"
+
+# handshake signals keyed by their first byte, compared undecoded
+_HANDSHAKE_SIGNALS = {b"C": _signal_controller, b"P": _signal_point}
+# seconds a connected peer has to send its handshake signal
+_HANDSHAKE_TIMEOUT = 5
+# default Agent.update commands, run in order without a shell
+_UPDATE_COMMANDS = ("sudo apt update", "sudo apt upgrade -y")
+
+
 class Agent:
-    """Agent class for deriving from, for custom robotic agents."""
+    """
+    Agent class for deriving from, for custom robotic agents.
+
+    Instance attributes are declared in __slots__. Subclasses that do not \
+        declare their own __slots__ receive a __dict__ as usual, subclasses \
+            that do must list any attributes they add.
+    """
+
+    __slots__ = ("_uuid", "network", "lookup", "_uuid_bytes")
 
     def __init__(self, uuid: str = "6ae2f3bd-2b55-468a-88a3-af0eeae03896",
                  uuid_is_path: bool = False):
@@ -36,6 +136,8 @@ class Agent:
         :param uuid_is_path: if True treats parameter uuid as path to file
             containing the agent uuid, default False
         :type uuid_is_path: bool
+        :ivar self.uuid: str, agent UUID, stripped of surrounding whitespace if
+            read from file
         :ivar self.lookup: dict, keys being commands that translate to function
             calls, defaulted to if Agent.client_listen parameter lookup is
             None, can be directly overwritten, see unionize parameter for
@@ -46,21 +148,39 @@ class Agent:
             "REQUEST TYPE": self.network.send("KINETIC"),
             "REQUEST UUID": self.network.send(self.uuid)}
         """
-        if uuid_is_path is True:
-            with open(uuid) as uuid_handle:
-                self.uuid = uuid_handle.read()
+        if uuid_is_path:
+            with open(uuid, "rb") as uuid_handle:
+                self.uuid = uuid_handle.read().strip().decode("ascii")
         else:
             self.uuid = uuid
         self.network: Union[swbs.Interface, swbs.Client, swbs.Host] = \
             swbs.Interface
         # noinspection PyUnresolvedReferences
         self.lookup = {
-            "STOP": lambda: self.stop(0),
-            "UPDATE": lambda: self.update(),
-            "SHUTDOWN": lambda: self.shutdown(),
-            "REBOOT": lambda: self.reboot(),
-            "REQUEST TYPE": lambda: self.network.send("KINETIC"),
-            "REQUEST UUID": lambda: self.network.send(self.uuid)}
+            "STOP": partial(self.stop, 0),
+            "UPDATE": self.update,
+            "SHUTDOWN": self.shutdown,
+            "REBOOT": self.reboot,
+            "REQUEST TYPE": lambda: self.network.send(_KINETIC),
+            "REQUEST UUID": lambda: self.network.send(self._uuid_bytes)}
+
+    @property
+    def uuid(self) -> str:
+        """
+        Agent UUID, REQUEST UUID replies with it.
+
+        Encoded once when assigned, so REQUEST UUID sends it without \
+            encoding on every request, and always sends the current value.
+
+        :return: agent UUID
+        :rtype: str
+        """
+        return self._uuid
+
+    @uuid.setter
+    def uuid(self, uuid: str) -> None:
+        self._uuid = uuid
+        self._uuid_bytes = uuid.encode("ascii")
 
     def network_init(self, host: str = "arbiter.local", port: int = 999,
                      key: Union[str, bytes, None] = None,
@@ -71,13 +191,17 @@ class Agent:
 
         If one is not specified, tries arbiter.local as hostname.
         If connection fails, initializes self temporarily into a Host \
-            instance, waiting for a controller or a plain client pointing the \
-                agent to a controller.
+            instance on all interfaces, waiting for a controller or a plain \
+                client pointing the agent to a controller.
+
+        Hostnames are resolved once and reused on reconnect, until a \
+            connection to the resolved address fails.
 
         Client/controller should send b"CONTROLLER" or \
             b"POINT <HOSTNAME HERE>" respectively. If agent receives neither, \
-                restarts socket. If signaled to be controller, re-initializes \
-                    as client to controller with specified or default port.
+                or nothing within five seconds, restarts socket. If signaled \
+                    to be controller, re-initializes as client to controller \
+                        with specified or default port.
 
         If signaled to another host, connects to supplied host with specified \
             or default port.
@@ -99,35 +223,52 @@ class Agent:
             file for reading from, default False
         :type key_is_path: bool
         """
+        # read and validated once, every instance below reuses the bytes
+        key = swbs.Security.get_key(key, key_is_path)
+        client = None
         try:
-            self.network = swbs.Client(host, port, key, key_is_path)
-            self.network.connect()
+            client = swbs.Client(_resolve(host), port, key)
+            client.connect()
+            self.network = client
             return None
         except socket.error:
-            self.network.close()
-            self.network = swbs.Host(port, key, key_is_path=key_is_path)
+            # the controller may have a new DHCP or mDNS address, resolve
+            # again next time rather than retry the cached one
+            _resolve.cache_clear()
+            # only the failed client is closed, self.network is untouched
+            if client is not None:
+                client.close()
+            self.network = swbs.Host(port, key, "0.0.0.0")
             while True:
                 self.network.listen()
-                self.network.send("KINETIC WAITING FOR CONTROLLER")
-                signal = self.network.receive()
-                controller = None  # placeholder for scope
-                if signal == "CONTROLLER":
-                    controller = self.network.client_address[0]
-                elif signal[:5] == "POINT":
-                    # this prevents a dictionary switch statement,
-                    # find a rewrite
-                    controller = signal.split(" ")[1]
+                # a silent peer must not hold the only connection slot
+                self.network.socket.settimeout(_HANDSHAKE_TIMEOUT)
+                try:
+                    self.network.send("KINETIC WAITING FOR CONTROLLER")
+                    signal = self.network.receive(return_bytes=True)
+                except swbs.Exceptions.InterfaceError:
+                    signal = b""
+                handler = _HANDSHAKE_SIGNALS.get(signal[:1])
+                controller = None if handler is None else \
+                    handler(self.network, signal)
+                # swbs.Host.listen swaps the listening socket for the accepted
+                # connection, so a new Host is bound for the next attempt
+                # rather than restart(), which leaves an unbound socket
+                self.network.close()
                 if controller is not None:
-                    self.network.disconnect()
-                    self.network = swbs.Client(self.network.client_address[0],
-                                               port, key, key_is_path)
-                    self.network.connect()
+                    self.network = swbs.Client(_resolve(controller), port,
+                                               key)
+                    try:
+                        self.network.connect()
+                    except socket.error:
+                        _resolve.cache_clear()
+                        raise
                     return None
-                else:
-                    self.network.restart()
+                self.network = swbs.Host(port, key, "0.0.0.0")
 
     def client_listen(self, lookup: Union[dict, None] = None,
-                      no_encrypt: bool = False, unionize: bool = True) -> None:
+                      no_encrypt: bool = False, unionize: bool = True,
+                      acknowledge: bool = True) -> None:
         """
         Blocking function that listens for controller input over \
             self.network, looks up input as key with lookup dictionary, \
@@ -145,6 +286,9 @@ class Agent:
                 containing length, and start a for loop lasting the length of \
                     command list.
 
+        The command set is read once when listening starts, later changes to \
+            lookup or self.lookup take effect on the next call.
+
         If self.network is not swbs.Client, raises Exceptions.AgentError.
 
         :param lookup: dictionary containing commands as keys and associated
@@ -158,33 +302,56 @@ class Agent:
             otherwise if False AES encryption is enabled, default False
         :type no_encrypt: bool
         :param unionize: merge self.lookup and parameter lookup for usage as
-            command dictionary if True, default True, leave as True unless
-            critically needed, be sure to respect ARIA specifications
+            command dictionary if True, entries of self.lookup take
+            precedence, parameter lookup itself is left unmodified, default
+            True, leave as True unless critically needed, be sure to respect
+            ARIA specifications
         :type unionize: bool
+        :param acknowledge: if True reply "OK" to every valid command and
+            HELP request, if False valid commands are acknowledged implicitly
+            and only "KEYERROR" is sent back, halving TXs for controllers that
+            pipeline commands, default True
+        :type acknowledge: bool
         """
-        if isinstance(self.network, swbs.Client) is not True:
+        if not isinstance(self.network, swbs.Client):
             raise Exceptions.AgentError("Instance is not in client state.")
         if lookup is None:
             lookup = self.lookup
-        else:
-            if isinstance(self.lookup, dict) is True and unionize is True:
-                lookup.update(self.lookup)
-        if isinstance(lookup, dict) is not True:
+        if not isinstance(lookup, dict):
             raise Exceptions.AgentError(
                 "Lookup dictionary is not a dict type.")
+        # commands are matched against raw received bytes, skipping the
+        # decode of every message, neither lookup is modified
+        commands = {command.encode("utf-8"): function
+                    for command, function in lookup.items()}
+        if unionize and lookup is not self.lookup and \
+                isinstance(self.lookup, dict):
+            commands.update((command.encode("utf-8"), function)
+                            for command, function in self.lookup.items())
+        # HELP reply is encoded once here instead of on every request
+        help_length = str(len(commands)).encode("ascii")
+        help_commands = tuple(commands)
+        # bound once, self.network does not change while listening
+        receive = self.network.receive
+        send = self.network.send
         while True:
-            controller_input = self.network.receive(no_decrypt=no_encrypt)
-            if controller_input in list(lookup.keys()):
-                self.network.send("OK", no_encrypt=no_encrypt)
-                lookup[controller_input]()
+            controller_input = receive(no_decrypt=no_encrypt,
+                                       return_bytes=True)
+            function = commands.get(controller_input)
+            if function is not None:
+                if acknowledge:
+                    send(_OK, no_encrypt=no_encrypt)
+                function()
+            elif controller_input == _HELP:
+                if acknowledge:
+                    send(_OK, no_encrypt=no_encrypt)
+                # sent as separate TXs, the controller reads the list one
+                # receive at a time
+                send(help_length, no_encrypt=no_encrypt)
+                for command in help_commands:
+                    send(command, no_encrypt=no_encrypt)
             else:
-                if controller_input == "HELP":
-                    self.network.send("OK", no_encrypt=no_encrypt)
-                    self.network.send(str(len(list(lookup.keys()))))
-                    for x in list(lookup.keys()):
-                        self.network.send(x, no_encrypt=no_encrypt)
-                else:
-                    self.network.send("KEYERROR", no_encrypt=no_encrypt)
+                send(_KEYERROR, no_encrypt=no_encrypt)
 
     def stop(self, status: int,
              extended_callbacks: Union[Callable, None] = None,
@@ -229,11 +396,12 @@ class Agent:
         :param callback_params: parameters for extended_callbacks, default
             empty tuple
         :type callback_params: tuple
-        :param command: shutdown command called through shell, default for
-            Linux
+        :param command: shutdown command, split into arguments and executed
+            without a shell, so shell syntax such as pipes, &&, or variable
+            assignments is not interpreted, default for Linux
         :type command: str
         """
-        call(command, shell=True)
+        _spawn(command)
         Agent.stop(self, status, extended_callbacks, callback_params)
 
     def reboot(self, status: int = 0,
@@ -257,20 +425,31 @@ class Agent:
         :param callback_params: parameters for extended_callbacks, default
             empty tuple
         :type callback_params: tuple
-        :param command: reboot command called through shell, default for
-            Linux
+        :param command: reboot command, split into arguments and executed
+            without a shell, so shell syntax such as pipes, &&, or variable
+            assignments is not interpreted, default for Linux
         :type command: str
         """
-        call(command, shell=True)
+        _spawn(command)
         Agent.stop(self, status, extended_callbacks, callback_params)
 
     @staticmethod
-    def update(command: str = "sudo apt update && apt upgrade -y") -> None:
+    def update(command: Union[str, Tuple[str, ...]] = _UPDATE_COMMANDS) \
+            -> None:
         """
-        Run OS-level update command, default for Linux distributions using \
+        Run OS-level update commands, default for Linux distributions using \
             the APT package manager.
 
-        :param command: update command called through shell, default for Linux
-        :type command: str
+        Commands run one after another, stopping at the first that exits \
+            with a non-zero status, as they would when joined with && in a \
+                shell.
+
+        :param command: update command, or sequence of commands, each split
+            into arguments and executed without a shell, so shell syntax such
+            as pipes, &&, or variable assignments is not interpreted, default
+            sudo apt update then sudo apt upgrade -y
+        :type command: Union[str, Tuple[str, ...]]
         """
-        call(command, shell=True)
+        for step in (command,) if isinstance(command, str) else command:
+            if _spawn(step) != 0:
+                break
@@ -1,12 +1,36 @@
 """Module for various abstractions to common actions that may involve \
     controlling multiple components."""
 
+from typing import Tuple, Callable
 from kinetic import components as Components
 
 
+def _commit(motors) -> None:
+    """
+    Send the pending commands of motors, with one batched write per \
+        controller, see Components.Kinetics.Motor.pending_commands.
+
+    :param motors: Components.Kinetics.Motor instances, already set with
+        autocommit disabled
+    """
+    batches: dict = {}
+    for motor in motors:
+        # every motor sends at least its brake state, none is left out
+        batches.setdefault(motor.controller, []).append(
+            (motor, motor.pending_commands()))
+    for controller, pending in batches.items():
+        controller.send_batch(*(command for _, commands in pending
+                                for command in commands))
+        for motor, commands in pending:
+            motor.mark_committed(commands)
+
+
 class DualMotor:
     """Abstraction for dual motor drive train."""
 
+    __slots__ = ("motor_left", "motor_right", "_left_control",
+                 "_right_control")
+
     def __init__(self, motor_left: Components.Kinetics.Motor,
                  motor_right: Components.Kinetics.Motor):
         """
@@ -21,6 +45,27 @@ class DualMotor:
         """
         self.motor_left = motor_left
         self.motor_right = motor_right
+        # bound once, motors are not expected to be swapped after creation
+        self._left_control = motor_left.set_control
+        self._right_control = motor_right.set_control
+
+    def _drive(self, left: int, right: int, speed: int) -> None:
+        """
+        Set both motors in one step, direction given per side, motors \
+            sharing a controller are committed in a single serial write.
+
+        :param left: 1 for left motor forwards, -1 for backwards
+        :type left: int
+        :param right: 1 for right motor forwards, -1 for backwards
+        :type right: int
+        :param speed: see DualMotor.forward
+        :type speed: int
+        """
+        # clamped once here rather than per motor in set_control
+        speed = 1 if speed > 1 or speed < -1 else abs(speed)
+        self._left_control(left * speed, False)
+        self._right_control(right * speed, False)
+        _commit((self.motor_left, self.motor_right))
 
     def forward(self, speed: int = 1) -> None:
         """
@@ -33,8 +78,7 @@ class DualMotor:
             is safely ignored, default 1
         :type speed: int, optional
         """
-        self.motor_left.forward(speed)
-        self.motor_right.forward(speed)
+        self._drive(1, 1, speed)
 
     def backward(self, speed: int = 1) -> None:
         """
@@ -48,8 +92,7 @@ class DualMotor:
             is safely ignored, default 1
         :type speed: int, optional
         """
-        self.motor_left.backward(speed)
-        self.motor_right.backward(speed)
+        self._drive(-1, -1, speed)
 
     def clockwise(self, speed: int = 1) -> None:
         """
@@ -63,8 +106,7 @@ class DualMotor:
             is safely ignored, default 1
         :type speed: int, optional
         """
-        self.motor_left.forward(speed)
-        self.motor_right.backward(speed)
+        self._drive(1, -1, speed)
 
     def counterclockwise(self, speed: int = 1) -> None:
         """
@@ -78,13 +120,91 @@ class DualMotor:
             is safely ignored, default 1
         :type speed: int, optional
         """
-        self.motor_left.backward(speed)
-        self.motor_right.forward(speed)
+        self._drive(-1, 1, speed)
+
+
+# shared by all generated drive train actions
+_SPEED_DOC = """
+        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
+            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
+            is safely ignored, default 1
+        :type speed: int, optional
+        """
+
+
+def _action(pattern: Tuple[int, int, int, int]) -> Callable:
+    """
+    Build a drive train action method applying pattern, see _with_actions.
+
+    :param pattern: direction per motor, see QuadMotor._ACTIONS
+    :type pattern: Tuple[int, int, int, int]
+    :return: method taking speed
+    :rtype: Callable
+    """
+    # zero entries are dropped once here, _apply only visits moving motors
+    active = tuple((index, direction) for index, direction in
+                   enumerate(pattern) if direction)
+
+    def action(self, speed: int = 1) -> None:
+        self._apply(active, speed)
+    return action
+
+
+def _with_actions(cls: type) -> type:
+    """
+    Class decorator adding a method for every entry in the _ACTIONS \
+        mapping declared on the class, each driving its motors through \
+            self._apply.
 
+    :param cls: drive train class declaring _ACTIONS
+    :type cls: type
+    :return: cls, with action methods added
+    :rtype: type
+    """
+    for name, (pattern, summary, note) in cls.__dict__["_ACTIONS"].items():
+        action = _action(pattern)
+        action.__name__ = name
+        action.__qualname__ = cls.__qualname__ + "." + name
+        action.__doc__ = "\n        " + summary + "\n\n        " + note + \
+            "\n" + _SPEED_DOC
+        setattr(cls, name, action)
+    return cls
 
+
+@_with_actions
 class QuadMotor:
     """Abstraction for quad motor drive train."""
 
+    __slots__ = ("motor_front_left", "motor_front_right", "motor_back_left",
+                 "motor_back_right", "_motors", "_controls")
+
+    # actions added by _with_actions, name to direction per motor in the
+    # order front-left, front-right, back-left, back-right, 1 forwards, -1
+    # backwards, 0 leaves the motor untouched, docstring summary and note
+    _ACTIONS = {
+        "forward": (
+            (1, 1, 1, 1),
+            "Quad-motor control to move forward.",
+            "Safe to use regardless if direction is disabled."),
+        "backward": (
+            (-1, -1, -1, -1),
+            "Quad-motor control to move backward.",
+            "Safe to use regardless if direction is disabled, however if "
+            "direction is disabled, is effectively the same as calling "
+            "QuadMotor.forward."),
+        "clockwise": (
+            (1, -1, 1, -1),
+            "Quad-motor control to spin clockwise, effectively turning "
+            "right.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.forward."),
+        "counterclockwise": (
+            (-1, 1, -1, 1),
+            "Quad-motor control to spin counterclockwise, effectively "
+            "turning left.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.forward.")}
+
     def __init__(self, motor_front_left: Components.Kinetics.Motor,
                  motor_front_right: Components.Kinetics.Motor,
                  motor_back_left: Components.Kinetics.Motor,
@@ -107,300 +227,136 @@ class QuadMotor:
         self.motor_front_right = motor_front_right
         self.motor_back_left = motor_back_left
         self.motor_back_right = motor_back_right
-
-    def forward(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to move forward.
-
-        Safe to use regardless if direction is disabled.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_front_left.forward(speed)
-        self.motor_front_right.forward(speed)
-        self.motor_back_left.forward(speed)
-        self.motor_back_right.forward(speed)
-
-    def backward(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to move backward.
-
-        Safe to use regardless if direction is disabled, however if direction \
-            is disabled, is effectively the same as calling QuadMotor.forward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_front_left.backward(speed)
-        self.motor_front_right.backward(speed)
-        self.motor_back_left.backward(speed)
-        self.motor_back_right.backward(speed)
-
-    def clockwise(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to spin clockwise, effectively turning right.
-
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.forward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_front_left.forward(speed)
-        self.motor_back_left.forward(speed)
-        self.motor_front_right.backward(speed)
-        self.motor_back_right.backward(speed)
-
-    def counterclockwise(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to spin counterclockwise, effectively turning left.
-
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.forward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_front_left.backward(speed)
-        self.motor_back_left.backward(speed)
-        self.motor_front_right.forward(speed)
-        self.motor_back_right.forward(speed)
-
-
+        # bound once, motors are not expected to be swapped after creation
+        self._motors = (motor_front_left, motor_front_right, motor_back_left,
+                        motor_back_right)
+        self._controls = (motor_front_left.set_control,
+                          motor_front_right.set_control,
+                          motor_back_left.set_control,
+                          motor_back_right.set_control)
+
+    def _apply(self, active: Tuple[Tuple[int, int], ...],
+               speed: int) -> None:
+        """
+        Drive motors according to an action pattern, motors sharing a \
+            controller are committed in a single serial write.
+
+        :param active: pairs of motor index and direction for the motors an
+            action moves, derived from QuadMotor._ACTIONS by _action
+        :type active: Tuple[Tuple[int, int], ...]
+        :param speed: see QuadMotor.forward
+        :type speed: int
+        """
+        # clamped once here rather than per motor in set_control
+        speed = 1 if speed > 1 or speed < -1 else abs(speed)
+        controls = self._controls
+        for index, direction in active:
+            controls[index](direction * speed, False)
+        _commit([self._motors[index] for index, _ in active])
+
+
+@_with_actions
 class MecanumQuadMotor(QuadMotor):
     """Extends QuadMotor drive train with mecanum-wheel strafing."""
 
-    def __init__(self, *args):
-        """Class initialization."""
-        super().__init__(*args)
-
-    def left(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to strafe left.
-
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.forward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_front_left.backward(speed)
-        self.motor_back_left.forward(speed)
-        self.motor_front_right.forward(speed)
-        self.motor_back_right.backward(speed)
-
-    def right(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to strafe right.
-
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.forward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_front_left.forward(speed)
-        self.motor_back_left.backward(speed)
-        self.motor_front_right.backward(speed)
-        self.motor_back_right.forward(speed)
-
-    def diagonal_forward_left(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to move diagonally forward-left.
-
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.forward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_back_left.forward(speed)
-        self.motor_front_right.forward(speed)
-
-    def diagonal_forward_right(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to move diagonally forward-right.
-
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.forward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_front_left.forward(speed)
-        self.motor_back_right.forward(speed)
+    __slots__ = ()
+
+    # see QuadMotor._ACTIONS
+    _ACTIONS = {
+        "left": (
+            (-1, 1, 1, -1),
+            "Quad-motor control to strafe left.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.forward."),
+        "right": (
+            (1, -1, -1, 1),
+            "Quad-motor control to strafe right.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.forward."),
+        "diagonal_forward_left": (
+            (0, 1, 1, 0),
+            "Quad-motor control to move diagonally forward-left.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.forward."),
+        "diagonal_forward_right": (
+            (1, 0, 0, 1),
+            "Quad-motor control to move diagonally forward-right.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.forward."),
+        "diagonal_backward_left": (
+            (0, -1, -1, 0),
+            "Quad-motor control to move diagonally backward-left.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.backward."),
+        "diagonal_backward_right": (
+            (-1, 0, 0, -1),
+            "Quad-motor control to move diagonally backward-right.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.backward."),
+        "back_right_clockwise": (
+            (1, 0, 1, 0),
+            "Quad-motor control to spin clockwise around the back right "
+            "corner, effectively turning right.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.forward."),
+        "back_right_counterclockwise": (
+            (-1, 0, -1, 0),
+            "Quad-motor control to spin counterclockwise around the back "
+            "right corner, effectively turning left.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.forward."),
+        "front_left_clockwise": (
+            (0, 1, 0, 1),
+            "Quad-motor control to spin clockwise around the front left "
+            "corner, effectively turning right.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.forward."),
+        "front_left_counterclockwise": (
+            (0, -1, 0, -1),
+            "Quad-motor control to spin counterclockwise around the front "
+            "left corner, effectively turning left.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.forward."),
+        "back_clockwise": (
+            (1, -1, 0, 0),
+            "Quad-motor control to spin clockwise around the center of the "
+            "back, effectively turning right.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.forward."),
+        "back_counterclockwise": (
+            (-1, 1, 0, 0),
+            "Quad-motor control to spin counterclockwise around the center "
+            "of the back, effectively turning left.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.forward."),
+        "front_clockwise": (
+            (0, 0, 1, -1),
+            "Quad-motor control to spin clockwise around the center of the "
+            "front, effectively turning right.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.forward."),
+        "front_counterclockwise": (
+            (0, 0, -1, 1),
+            "Quad-motor control to spin counterclockwise around the center "
+            "of the front, effectively turning left.",
+            "Requires at least direction control, otherwise is effectively "
+            "the same as calling QuadMotor.forward.")}
 
-    def diagonal_backward_left(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to move diagonally backward-left.
-
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.backward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_back_left.backward(speed)
-        self.motor_front_right.backward(speed)
-
-    def diagonal_backward_right(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to move diagonally backward-right.
-
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.backward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_front_left.backward(speed)
-        self.motor_back_right.backward(speed)
-
-    def back_right_clockwise(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to spin clockwise around the back right corner, \
-            effectively turning right.
-
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.forward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_front_left.forward(speed)
-        self.motor_back_left.forward(speed)
-
-    def back_right_counterclockwise(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to spin counterclockwise around the back right \
-            corner, effectively turning left.
-
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.forward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_front_left.backward(speed)
-        self.motor_back_left.backward(speed)
-
-    def front_left_clockwise(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to spin clockwise around the front left corner, \
-            effectively turning right.
-
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.forward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_front_right.forward(speed)
-        self.motor_back_right.forward(speed)
-
-    def front_left_counterclockwise(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to spin counterclockwise around the front left \
-            corner, effectively turning left.
-
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.forward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_front_right.backward(speed)
-        self.motor_back_right.backward(speed)
-
-    def back_clockwise(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to spin clockwise around the center of the back, \
-            effectively turning right.
-
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.forward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_front_left.forward(speed)
-        self.motor_front_right.backward(speed)
-
-    def back_counterclockwise(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to spin counterclockwise around the center of the \
-            back, effectively turning left.
-
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.forward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_front_left.backward(speed)
-        self.motor_front_right.forward(speed)
-
-    def front_clockwise(self, speed: int = 1) -> None:
-        """
-        Quad-motor control to spin clockwise around the center of the front, \
-            effectively turning right.
-
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.forward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
-        """
-        self.motor_back_left.forward(speed)
-        self.motor_back_right.backward(speed)
-
-    def front_counterclockwise(self, speed: int = 1) -> None:
+    def __init__(self, motor_front_left: Components.Kinetics.Motor,
+                 motor_front_right: Components.Kinetics.Motor,
+                 motor_back_left: Components.Kinetics.Motor,
+                 motor_back_right: Components.Kinetics.Motor):
         """
-        Quad-motor control to spin counterclockwise around the center of the \
-            front, effectively turning left.
+        Class initialization, see QuadMotor.
 
-        Requires at least direction control, otherwise is effectively the \
-            same as calling QuadMotor.forward.
-
-        :param speed: absolute, 0 < x =< 1 indicating motor speed, return None
-            if 0, x > 1 will result in x becoming 1, if PWM is disabled speed
-            is safely ignored, default 1
-        :type speed: int, optional
+        :param motor_front_left: front-left-side motor
+        :type motor_front_left: Components.Kinetics.Motor
+        :param motor_front_right: front-right-side motor
+        :type motor_front_right: Components.Kinetics.Motor
+        :param motor_back_left: back-left-side motor
+        :type motor_back_left: Components.Kinetics.Motor
+        :param motor_back_right: back-right-side motor
+        :type motor_back_right: Components.Kinetics.Motor
         """
-        self.motor_back_left.backward(speed)
-        self.motor_back_right.forward(speed)
+        super().__init__(motor_front_left, motor_front_right, motor_back_left,
+                         motor_back_right)
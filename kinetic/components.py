@@ -2,12 +2,47 @@
 
 from typing import Union, Tuple, Literal
 from time import sleep
+from threading import Thread, Event, Lock
+from inspect import signature
+from hashlib import md5
+from warnings import warn
 import cv2
+import numpy
 import swbs
 from imutils.video import VideoStream
 from kinetic import controllers as Controllers
 from kinetic.exceptions import ComponentError
 
+try:
+    # optional, SIMD JPEG encoding through libjpeg-turbo
+    from turbojpeg import TurboJPEG
+except ImportError:
+    TurboJPEG = None
+
+# SenseHAT LED matrix image, 64 RGB pixels
+PixelImage = Tuple[(Tuple[int, int, int],) * 64]
+# encoded MOTOR_SPEED values, indexed by 8-bit PWM duty
+_DUTY = tuple(b"%d" % duty for duty in range(256))
+# PyTurboJPEG 2 and later can encode into a caller-owned buffer
+_TURBOJPEG_DST = TurboJPEG is not None and \
+    "dst" in signature(TurboJPEG.encode).parameters
+# encode buffers cycled through by USBCamera, a frame in one buffer stays
+# intact while the next two frames are being encoded and sent
+_JPEG_BUFFER_COUNT = 3
+
+
+class _PollGeneration:
+    """One in-flight SenseHAT poll_all read, shared by threads joining it."""
+
+    __slots__ = ("done", "readings")
+
+    def __init__(self):
+        """Class initialization, creating instance variables."""
+        # set once the read has finished, successfully or not
+        self.done: Event = Event()
+        # None if the read raised
+        self.readings: Union[dict, None] = None
+
 
 class Generic:
     """
@@ -65,9 +100,25 @@ class Kinetics:
             self.is_pwm_enabled: bool = enable_pwm
             self.is_direction_enabled: bool = enable_direction
             self.keymap: dict = keymap
-            if isinstance(controller, Controllers.Serial) is not True:
+            # encoded once and grouped by control sign, set_control sends
+            # these on every actuation
+            commands = Controllers.encode_keymap(keymap)
+            self._brake: bytes = commands["BRAKE"]
+            self._speed: Union[bytes, None] = commands.get("SPEED")
+            self._forwards: tuple = (commands["FORWARDS"],
+                                     commands["RELEASE"])
+            self._backwards: tuple = (commands["BACKWARDS"],
+                                      commands["RELEASE"]) \
+                if enable_direction else self._forwards
+            # speed duty and direction command last written to the
+            # controller, the endpoint latches them so repeats are skipped
+            self._duty_sent: Union[bytes, None] = None
+            self._direction_sent: Union[bytes, None] = None
+            if not isinstance(controller, Controllers.Serial):
                 raise ComponentError("Unsupported controller.")
             self.controller = controller
+            # the endpoint resets when the port is reopened, losing both
+            controller.add_open_callback(self.invalidate)
 
         def set_control(self, new: Union[float, int],
                         autocommit: bool = True) -> None:
@@ -75,6 +126,12 @@ class Kinetics:
             Set self.control, unless autocommit is False, forwards to serial \
                 resulting in actuation.
 
+            Speed and direction are only sent when they differ from the \
+                last ones committed, the endpoint latches them between \
+                    commands. The brake hold or release is always sent. If a \
+                        write may have been lost, call Motor.invalidate to \
+                            send everything again.
+
             :param new: limited to -1 to 1, abstracts motor direction where 1
                 is forwards, -1 is backwards, and 0 is full-stop, gradients
                 between 1 to 0 and 0 to -1 control speed (if PWM is available)
@@ -83,23 +140,81 @@ class Kinetics:
                 immediately to serial
             :type autocommit: bool
             """
-            self.control = min([max([new, -1]), 1])
-            if autocommit is True:
-                if self.control == 0:
-                    self.controller.send(self.keymap["BRAKE"])
-                    return None
-                if self.is_pwm_enabled is True:
-                    self.controller.send(
-                        self.keymap["SPEED"], "SEND",
-                        (str(round(255 * abs(self.control))),))
-                if self.is_direction_enabled is False:
-                    self.controller.send(self.keymap["FORWARDS"])
-                else:
-                    if self.control > 0:
-                        self.controller.send(self.keymap["FORWARDS"])
-                    elif self.control < 0:
-                        self.controller.send(self.keymap["BACKWARDS"])
-                self.controller.send(self.keymap["RELEASE"])
+            self.control = -1 if new < -1 else 1 if new > 1 else new
+            if autocommit:
+                batch = self.pending_commands()
+                # speed, direction, and brake release go out as one write
+                self.controller.send_batch(*batch)
+                self.mark_committed(batch)
+
+        def commands(self) -> list:
+            """
+            Build every serial command actuating self.control, regardless \
+                of what was committed before.
+
+            :return: encoded commands, in order
+            :rtype: list
+            """
+            if self.control == 0:
+                return [self._brake]
+            direction = self._forwards if self.control > 0 else \
+                self._backwards
+            if not self.is_pwm_enabled:
+                return list(direction)
+            return [self._speed, _DUTY[round(255 * abs(self.control))],
+                    *direction]
+
+        def pending_commands(self) -> list:
+            """
+            Build serial commands actuating self.control, as sent by \
+                Motor.set_control, leaving out speed and direction if they \
+                    are unchanged since the last commit.
+
+            For committing several motors sharing a controller in a single \
+                Serial.send_batch call, record the sent commands with \
+                    Motor.mark_committed.
+
+            :return: encoded commands, in order
+            :rtype: list
+            """
+            if self.control == 0:
+                return [self._brake]
+            direction, release = self._forwards if self.control > 0 else \
+                self._backwards
+            batch = []
+            if self.is_pwm_enabled:
+                duty = _DUTY[round(255 * abs(self.control))]
+                if duty != self._duty_sent:
+                    batch += (self._speed, duty)
+            if direction != self._direction_sent:
+                batch.append(direction)
+            batch.append(release)
+            return batch
+
+        def mark_committed(self, batch: list) -> None:
+            """
+            Record the speed and direction in commands written to the \
+                controller, see Motor.pending_commands.
+
+            :param batch: commands sent, as returned by Motor.pending_commands
+            :type batch: list
+            """
+            if self._speed is not None and self._speed in batch:
+                self._duty_sent = batch[batch.index(self._speed) + 1]
+            if self._forwards[0] in batch:
+                self._direction_sent = self._forwards[0]
+            elif self._backwards[0] in batch:
+                self._direction_sent = self._backwards[0]
+
+        def invalidate(self) -> None:
+            """
+            Forget the speed and direction last committed, so the next \
+                commit sends them again.
+
+            Called by the controller when its port is reopened. Call it \
+                directly if a write may have been lost.
+            """
+            self._duty_sent = self._direction_sent = None
 
         def forward(self, speed: int = 1) -> None:
             """
@@ -144,17 +259,20 @@ class Sensors:
     class USBCamera:
         """Generic USB camera."""
 
-        def __init__(self, source: int = 0, use_pi_camera: bool = False,
+        def __init__(self, source: Union[int, str] = 0,
+                     use_pi_camera: bool = False,
                      resolution: Tuple[int, int] = (1920, 1080),
-                     frame_rate: int = 60, quality: int = 80):
+                     frame_rate: int = 60, quality: int = 80,
+                     mjpeg_passthrough: bool = False):
             """
             Class initialization, creating instance variables.
 
             Accepts no controller.
 
             :param source: source index piped into VideoStream src parameter,
-                default 0
-            :type source: int
+                or a GStreamer pipeline string ending in an appsink, see
+                gstreamer_pipeline, default 0
+            :type source: Union[int, str]
             :param use_pi_camera: whether to use a Raspberry Pi camera (if
                 installed) piped into VideoStream usePiCamera parameter,
                 default False
@@ -166,18 +284,104 @@ class Sensors:
             :param quality: int, image quality to compress to, 0-100,
                 higher quality costs more bandwidth to transmit, the opposite
                 is true for lower quality, default 80
+            :param mjpeg_passthrough: if True and not using a Raspberry Pi
+                camera, requests MJPEG from the camera and forwards its JPEG
+                frames without re-encoding, quality is then decided by the
+                camera, default False
+            :type mjpeg_passthrough: bool
             """
-            self.source: int = source
+            self.source: Union[int, str] = source
             self.use_pi_camera: bool = use_pi_camera
             self.resolution: Tuple[int, int] = resolution
             self.frame_rate: int = frame_rate
             self.stream: Union[None, VideoStream] = None
             self.quality: int = quality
+            self.mjpeg_passthrough: bool = mjpeg_passthrough
+            # cv2.imencode parameters, rebuilt only if self.quality changes
+            self._imencode_params: Tuple[int, int] = (
+                int(cv2.IMWRITE_JPEG_QUALITY), quality)
+            # TurboJPEG is used for encoding if it and libjpeg-turbo are
+            # installed, otherwise falls back to cv2.imencode
+            self._turbo_jpeg = None
+            if TurboJPEG is not None:
+                try:
+                    self._turbo_jpeg = TurboJPEG()
+                except (OSError, RuntimeError):
+                    pass
+            # last raw frame read and its encoding, imutils hands out a new
+            # array per captured frame so identity means nothing new
+            self._last_frame = None
+            self._last_image: Union[bytes, memoryview, None] = None
+            # TurboJPEG output buffers, allocated on first use and regrown if
+            # the frame size increases
+            self._jpeg_buffers: list = [None] * _JPEG_BUFFER_COUNT
+            self._jpeg_buffer_index: int = 0
+            # single frame slot filled by broadcast_stream's encoder thread
+            self._latest_frame: Union[bytes, memoryview, None] = None
+            # raw frame the published image was encoded from, for debug
+            # display on the sending thread
+            self._latest_raw = None
+            # exception that stopped the encoder thread, re-raised by
+            # broadcast_stream
+            self._encoder_error: Union[Exception, None] = None
+            self._fresh_frame: Event = Event()
+            self._free_slot: Event = Event()
+            self._broadcasting: bool = False
 
         def start_stream(self) -> None:
-            """Create and start VideoStream object, self.stream."""
-            self.stream = VideoStream(self.source, self.use_pi_camera,
-                                      self.resolution, self.frame_rate).start()
+            """
+            Create and start VideoStream object, self.stream.
+
+            For USB cameras, limits the capture buffer to a single frame, \
+                so collected frames are the most recent rather than queued, \
+                    and if self.mjpeg_passthrough is True, requests undecoded \
+                        MJPEG frames.
+
+            Warns with RuntimeWarning if the backend cannot limit the \
+                capture buffer. Raises ComponentError if MJPEG passthrough \
+                    was requested and the backend cannot provide it.
+            """
+            stream = VideoStream(self.source, self.use_pi_camera,
+                                 self.resolution, self.frame_rate)
+            if not self.use_pi_camera and not isinstance(self.source, str):
+                # configured before the reader thread starts using it
+                capture = stream.stream.stream
+                if not capture.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+                    warn("Camera backend does not support CAP_PROP_BUFFERSIZE"
+                         ", collected frames may lag behind.", RuntimeWarning,
+                         stacklevel=2)
+                if self.mjpeg_passthrough and not (
+                        capture.set(cv2.CAP_PROP_FOURCC,
+                                    cv2.VideoWriter_fourcc(*"MJPG")) and
+                        capture.set(cv2.CAP_PROP_CONVERT_RGB, 0)):
+                    # frames would arrive in a format _encode cannot tell
+                    # apart from JPEG
+                    capture.release()
+                    raise ComponentError("Camera backend does not support "
+                                         "MJPEG passthrough.")
+            self.stream = stream.start()
+
+        def gstreamer_pipeline(self, camera_source: str = "libcamerasrc") \
+                -> str:
+            """
+            Build a GStreamer pipeline string for use as source, capturing \
+                at self.resolution and self.frame_rate.
+
+            The appsink holds at most one frame and drops older ones, \
+                serving as the single frame buffer for cameras that do not \
+                    go through V4L2, such as the Raspberry Pi camera on \
+                        libcamera. Requires OpenCV built with GStreamer.
+
+            :param camera_source: GStreamer source element and its \
+                properties, default libcamerasrc
+            :type camera_source: str
+            :return: pipeline string
+            :rtype: str
+            """
+            return (camera_source + " ! video/x-raw,width=%d,height=%d,"
+                    "framerate=%d/1 ! videoconvert ! video/x-raw,format=BGR ! "
+                    "appsink max-buffers=1 drop=true" % (
+                        *self.resolution, self.frame_rate))
 
         def stop_stream(self) -> None:
             """Stop VideoStream object, self.stream, and revert it back to \
@@ -186,36 +390,151 @@ class Sensors:
                 return None
             self.stream.stop()
             self.stream = None
+            self._last_frame = self._last_image = None
 
-        def collect_stream(self, debug: bool = False):
+        def collect_stream(self, debug: bool = False) -> \
+                Union[numpy.ndarray, None]:
             """
-            Read self.stream VideoStream, use cv2.IMWRITE_JPEG_QUALITY for \
-                compression.
+            Read self.stream VideoStream and compress it to JPEG with \
+                TurboJPEG if available, otherwise cv2.imencode.
+
+            If the camera has not captured a new frame since the last call, \
+                the previous image is returned again without encoding.
 
             :param debug: if True show collected image with cv2.imshow, default
                 False
             :type debug: bool
-            :return: cv2 JPEG encoded image, or None if video stream has not
-                been started and is still None
+            :return: JPEG encoded image as a one-dimensional uint8 array owned
+                by the caller, or None if video stream has not been started
+                and is still None
+            :rtype: Union[numpy.ndarray, None]
+            """
+            image = self._collect(debug)
+            if image is None:
+                return None
+            # copied out, the encoded image may be in a reused buffer
+            return numpy.array(image, numpy.uint8)
+
+        def _collect(self, debug: bool = False) -> \
+                Union[bytes, memoryview, None]:
+            """
+            Read and encode a frame without copying the result, see \
+                collect_stream.
+
+            With PyTurboJPEG 2 or later, the image is a memoryview into one \
+                of three reused buffers and is overwritten three encodes \
+                    later.
+
+            :param debug: see collect_stream
+            :type debug: bool
+            :return: JPEG encoded image, or None if video stream has not been
+                started and is still None
+            :rtype: Union[bytes, memoryview, None]
             """
             if self.stream is None:
                 return None
+            frame = self.stream.read()
+            if frame is None:
+                raise ComponentError("Camera stream failed to capture image.")
+            if debug:
+                Sensors.USBCamera._show(frame)
+            if frame is self._last_frame:
+                # camera has not produced a new frame since the last call
+                return self._last_image
+            image = self._encode(frame)
+            self._last_frame, self._last_image = frame, image
+            return image
+
+        @staticmethod
+        def _show(frame) -> None:
+            """
+            Show raw camera frame with cv2.imshow, call from the thread that \
+                owns the debug window, HighGUI is not thread safe on most \
+                    backends.
+
+            :param frame: raw frame read from self.stream
+            """
+            cv2.imshow("KINETIC COLLECT_STREAM DEBUG", frame
+                       if frame.ndim == 3 else
+                       cv2.imdecode(frame, cv2.IMREAD_COLOR))
+            cv2.waitKey(1)
+
+        def _encode(self, frame) -> Union[bytes, memoryview]:
+            """
+            Compress frame to JPEG, see Sensors.USBCamera._collect.
+
+            :param frame: image to be encoded
+            :return: JPEG encoded image
+            :rtype: Union[bytes, memoryview]
+            """
+            if frame.ndim < 3:
+                # undecoded MJPEG from the camera, see start_stream
+                return memoryview(frame.reshape(-1))
+            if self._turbo_jpeg is not None:
+                try:
+                    if not _TURBOJPEG_DST:
+                        return self._turbo_jpeg.encode(frame,
+                                                       quality=self.quality)
+                    buffer, size = self._turbo_jpeg.encode(
+                        frame, quality=self.quality,
+                        dst=self._next_jpeg_buffer(frame))
+                    return memoryview(buffer)[:size]
+                except OSError as parent_exception:
+                    raise ComponentError("Camera stream failed to capture "
+                                         "image.") from parent_exception
+            if self._imencode_params[1] != self.quality:
+                self._imencode_params = (int(cv2.IMWRITE_JPEG_QUALITY),
+                                         self.quality)
             # placeholder for encoding result
             result = None
             try:
-                result, image = cv2.imencode(
-                    ".jpg", self.stream.read(), [int(cv2.IMWRITE_JPEG_QUALITY),
-                                                 self.quality])
-                if debug is True:
-                    cv2.imshow("KINETIC COLLECT_STREAM DEBUG",
-                               self.stream.read())
-                    cv2.waitKey(1)
-                return image
+                result, image = cv2.imencode(".jpg", frame,
+                                             self._imencode_params)
+                # imencode allocates a new array per call, so a view of it
+                # stays valid and saves copying the image out
+                return memoryview(image.reshape(-1))
             except cv2.error as parent_exception:
                 print("CV IMENCODE RESULT: ", result)
                 raise ComponentError("Camera stream failed to capture image."
                                      ) from parent_exception
 
+        def _next_jpeg_buffer(self, frame) -> bytearray:
+            """
+            Return the next TurboJPEG output buffer in rotation, large \
+                enough for frame.
+
+            :param frame: image about to be encoded
+            :return: writable buffer for TurboJPEG.encode dst parameter
+            :rtype: bytearray
+            """
+            index = self._jpeg_buffer_index
+            self._jpeg_buffer_index = (index + 1) % _JPEG_BUFFER_COUNT
+            size = self._turbo_jpeg.buffer_size(frame)
+            buffer = self._jpeg_buffers[index]
+            if buffer is None or len(buffer) < size:
+                buffer = self._jpeg_buffers[index] = bytearray(size)
+            return buffer
+
+        @staticmethod
+        def decode_frame(image: Union[bytes, bytearray, memoryview]) -> \
+                numpy.ndarray:
+            """
+            Decode a JPEG image received from broadcast_stream.
+
+            The image is viewed in place rather than copied into an array \
+                before decoding.
+
+            :param image: JPEG encoded image
+            :type image: Union[bytes, bytearray, memoryview]
+            :return: decoded BGR image
+            :rtype: numpy.ndarray
+            """
+            frame = cv2.imdecode(numpy.frombuffer(image, numpy.uint8),
+                                 cv2.IMREAD_COLOR)
+            if frame is None:
+                raise ComponentError("Failed to decode camera image.")
+            return frame
+
         def broadcast_stream(self, host: str, port: int,
                              key: Union[str, bytes, None],
                              key_is_path: bool = False,
@@ -233,15 +552,22 @@ class Sensors:
 
             TODO more compression
 
-            Decode the image on the receiving end with,
+            Decode the image on the receiving end with \
+                Sensors.USBCamera.decode_frame(host.receive(500000, \
+                    return_bytes=True)).
 
-            cv2.imdecode(numpy.frombuffer(host.receive(500000), numpy.uint8), \
-                cv2.IMREAD_COLOR)
+            Frames are collected and encoded on a background thread while \
+                the previous frame is being sent, the encoder holds at most \
+                    one frame ahead of the sender. Debug output is shown \
+                        from the calling thread.
 
-            If self.stream is None, returns None before execution starts.
+            If self.stream is None, returns None before execution starts, \
+                returns if self.stream is stopped while broadcasting.
             If ComponentError is raised when collecting VideoStream image, \
                 restarts camera and then waits 1 second, unless the delay is \
-                    specified otherwise, before resuming.
+                    specified otherwise, before resuming. Any other \
+                        exception stops the encoder thread, and is re-raised \
+                            by broadcast_stream once sending stops.
 
             :param host: hostname of host to connect to
             :type host: str
@@ -264,19 +590,73 @@ class Sensors:
                 return None
             streamer: swbs.Client = swbs.Client(host, port, key, key_is_path)
             streamer.connect()
-            while True:
-                try:
-                    frame = self.collect_stream(debug).tobytes()
-                    if debug is True:
-                        # yes, this fetches the MD5 class from swbs,
-                        # imported from Pycryptodomex, no I feel no shame
-                        print(swbs.MD5.new(frame).hexdigest())
+            self._broadcasting = True
+            self._encoder_error = None
+            self._fresh_frame.clear()
+            self._free_slot.set()
+            encoder = Thread(target=self._encode_frames,
+                             args=(restart_delay,), daemon=True)
+            encoder.start()
+            try:
+                while encoder.is_alive():
+                    if not self._fresh_frame.wait(1):
+                        continue
+                    self._fresh_frame.clear()
+                    frame, raw = self._latest_frame, self._latest_raw
+                    self._free_slot.set()
+                    if debug:
+                        print(md5(frame).hexdigest())
+                        Sensors.USBCamera._show(raw)
                     streamer.send(frame)
-                except ComponentError:
-                    Sensors.USBCamera.stop_stream(self)
-                    Sensors.USBCamera.start_stream(self)
-                    if restart_delay is not None:
-                        sleep(restart_delay)
+            finally:
+                self._broadcasting = False
+            if self._encoder_error is not None:
+                error, self._encoder_error = self._encoder_error, None
+                raise error
+
+        def _encode_frames(self, restart_delay: Union[int, None]) -> None:
+            """
+            Collect frames into self._latest_frame until self.stream is \
+                stopped or broadcast_stream returns, encoder thread target \
+                    for broadcast_stream.
+
+            A frame is only published once the sender has taken the previous \
+                one, so the frame being sent, the published frame, and the \
+                    frame being encoded occupy different JPEG buffers.
+
+            An exception other than ComponentError is stored in \
+                self._encoder_error for broadcast_stream to re-raise.
+
+            :param restart_delay: see broadcast_stream
+            :type restart_delay: Union[int, None]
+            """
+            try:
+                previous = None
+                while self._broadcasting:
+                    try:
+                        frame = self._collect()
+                    except ComponentError:
+                        Sensors.USBCamera.stop_stream(self)
+                        Sensors.USBCamera.start_stream(self)
+                        if restart_delay is not None:
+                            sleep(restart_delay)
+                        continue
+                    if frame is None:
+                        return None
+                    if frame is previous:
+                        # nothing new from the camera, wait about a frame
+                        sleep(1 / self.frame_rate)
+                        continue
+                    previous = frame
+                    while not self._free_slot.wait(1):
+                        if not self._broadcasting:
+                            return None
+                    self._free_slot.clear()
+                    self._latest_frame = frame
+                    self._latest_raw = self._last_frame
+                    self._fresh_frame.set()
+            except Exception as exception:
+                self._encoder_error = exception
 
     class VL53L0X:
         """
@@ -299,12 +679,14 @@ class Sensors:
             :type keymap: dict
             """
             self.keymap: dict = keymap
-            if isinstance(controller, Controllers.Serial) is True:
+            self._collect: bytes = \
+                Controllers.encode_keymap(keymap)["COLLECT"]
+            if isinstance(controller, Controllers.Serial):
                 self.controller = controller
             else:
                 raise ComponentError("Unsupported controller.")
 
-        def collect(self, round_to: Union[int, None]) -> \
+        def collect(self, round_to: Union[int, None] = None) -> \
                 Union[int, float, None]:
             """
             Collect distance data from sensor.
@@ -315,13 +697,13 @@ class Sensors:
             :return: distance in millimeters, None if type conversion failed
             :rtype: Union[int, float, None]
             """
-            self.controller.send(self.keymap["COLLECT"])
+            self.controller.send(self._collect)
             try:
-                result = int(self.controller.receive())
+                result = int(self.controller.receive(return_bytes=True))
             except ValueError:
                 return None
             if round_to is not None:
-                round(result, round_to)
+                result = round(result, round_to)
             return result
 
     class SenseHAT:
@@ -340,13 +722,23 @@ class Sensors:
             """
             self.sense = sense.sense
             try:
+                # imported here, gpiozero detects pin factories on import,
+                # which agents without a SenseHAT should not pay for
                 # pylint: disable=import-outside-toplevel
                 from gpiozero import CPUTemperature
             except ModuleNotFoundError as parent_exception:
                 raise ComponentError("SenseHAT component was initialized "
                                      "without pre-requisites.") from \
                                          parent_exception
-            self.cpu_temperature: CPUTemperature = CPUTemperature
+            # created once, reading .temperature is a single sysfs read
+            self.cpu_temperature: CPUTemperature = CPUTemperature()
+            # compass, gyroscope, accelerometer, as enabled by the SenseHAT
+            # controller, see configure_imu
+            self._imu_config: Tuple[bool, bool, bool] = (True, True, True)
+            # read in flight for poll_all, threads polling at the same time
+            # join it and share its readings, guarded by self._poll_lock
+            self._poll_lock: Lock = Lock()
+            self._poll: Union[_PollGeneration, None] = None
 
         def get_temperature(self, offset_cpu: bool = True,
                             round_to: Union[int, None] = None) -> \
@@ -363,8 +755,8 @@ class Sensors:
             :return: Union[int, float], temperature in Celsius
             """
             raw = self.sense.get_temperature()
-            if offset_cpu is True:
-                raw = raw - (self.cpu_temperature() - raw) / 5.466
+            if offset_cpu:
+                raw = raw - (self.cpu_temperature.temperature - raw) / 5.466
             if round_to is not None:
                 raw = round(raw, round_to)
             return raw
@@ -401,9 +793,34 @@ class Sensors:
                 raw = round(raw, round_to)
             return raw
 
+        def configure_imu(self, compass: bool = True, gyroscope: bool = True,
+                          accelerometer: bool = True) -> None:
+            """
+            Enable or disable IMU sensors, all are enabled by the SenseHAT \
+                controller on initialization.
+
+            sense_hat's own get_gyroscope, get_compass, and \
+                get_accelerometer reconfigure the IMU to their one sensor. \
+                    Orientation and acceleration are therefore read through \
+                        get_orientation_degrees and get_accelerometer_raw, \
+                            which keep this configuration, and get_compass \
+                                applies it again after reading.
+
+            :param compass: if True enables the magnetometer, default True
+            :type compass: bool
+            :param gyroscope: if True enables the gyroscope, default True
+            :type gyroscope: bool
+            :param accelerometer: if True enables the accelerometer, default
+                True
+            :type accelerometer: bool
+            """
+            self._imu_config = (compass, gyroscope, accelerometer)
+            self.sense.set_imu_config(compass, gyroscope, accelerometer)
+
         def get_orientation(self, round_to: Union[int, None] = None) -> list:
             """
-            Collect orientation data in degrees on axes X, Y, and Z.
+            Collect orientation data in degrees on axes X, Y, and Z, fused \
+                from the IMU sensors enabled with configure_imu.
 
             :param round_to: decimal to round to, None to return raw, default
                 None
@@ -412,13 +829,12 @@ class Sensors:
                 in that order respectively
             :rtype: list
             """
-            self.sense.set_imu_config(True, True, True)
-            raw = self.sense.get_gyroscope()
-            for_return = [raw["roll"], raw["pitch"], raw["yaw"]]
+            # unlike get_gyroscope, does not reconfigure the IMU
+            raw = self.sense.get_orientation_degrees()
             if round_to is not None:
-                for x in range(0, len(for_return)):
-                    for_return[x] = round(for_return[x], round_to)
-            return for_return
+                return [round(raw[axis], round_to)
+                        for axis in ("roll", "pitch", "yaw")]
+            return [raw["roll"], raw["pitch"], raw["yaw"]]
 
         def get_accelerometer(self, round_to: Union[int, None] = None) -> list:
             """
@@ -432,28 +848,90 @@ class Sensors:
             :rtype: list
             """
             raw = self.sense.get_accelerometer_raw()
-            for_return = [raw["x"], raw["y"], raw["z"]]
             if round_to is not None:
-                for x in range(0, len(for_return)):
-                    for_return[x] = round(for_return[x], round_to)
-            return for_return
+                return [round(raw[axis], round_to) for axis in ("x", "y", "z")]
+            return [raw["x"], raw["y"], raw["z"]]
 
         def get_compass(self, round_to: Union[int, None] = None) -> \
                 Union[int, float]:
             """
             Collect compass data in degrees, 0 being north.
 
+            sense_hat switches the IMU to the magnetometer alone for the \
+                reading, the configure_imu configuration is applied again \
+                    afterwards.
+
             :param round_to: decimal to round to, None to return raw, default
                 None
             :type round_to: Union[int, None]
             :return: compass degrees
             :rtype: Union[int, float]
             """
-            raw = self.sense.get_compass()
+            try:
+                raw = self.sense.get_compass()
+            finally:
+                self.sense.set_imu_config(*self._imu_config)
             if round_to is not None:
                 raw = round(raw, round_to)
             return raw
 
+        def _read_all(self) -> dict:
+            """
+            Read every SenseHAT sensor back-to-back, see poll_all.
+
+            :return: raw readings, see poll_all
+            :rtype: dict
+            """
+            return {"TEMPERATURE": self.get_temperature(),
+                    "PRESSURE": self.get_pressure(),
+                    "HUMIDITY": self.get_humidity(),
+                    "ORIENTATION": self.get_orientation(),
+                    "ACCELEROMETER": self.get_accelerometer(),
+                    "COMPASS": self.get_compass()}
+
+        def poll_all(self, round_to: Union[int, None] = None) -> dict:
+            """
+            Collect all SenseHAT sensor readings back-to-back.
+
+            If another thread is already polling, waits for it and returns \
+                its readings instead of reading the sensors again. If that \
+                    read fails, the sensors are read again on this thread.
+
+            :param round_to: decimal to round to, None to return raw, default
+                None
+            :type round_to: Union[int, None]
+            :return: readings keyed TEMPERATURE (CPU offset), PRESSURE,
+                HUMIDITY, ORIENTATION, ACCELEROMETER, and COMPASS, see their
+                respective get_ methods
+            :rtype: dict
+            """
+            with self._poll_lock:
+                generation = self._poll
+                leader = generation is None
+                if leader:
+                    generation = self._poll = _PollGeneration()
+            if leader:
+                try:
+                    poll = generation.readings = self._read_all()
+                finally:
+                    # later calls start a new read rather than reuse this one
+                    with self._poll_lock:
+                        self._poll = None
+                    generation.done.set()
+            else:
+                generation.done.wait()
+                poll = generation.readings
+                if poll is None:
+                    # the shared read raised, raise on this thread as well
+                    poll = self._read_all()
+            if round_to is None:
+                # lists are copied, the readings may be shared across threads
+                return {key: list(value) if isinstance(value, list) else value
+                        for key, value in poll.items()}
+            return {key: [round(axis, round_to) for axis in value]
+                    if isinstance(value, list) else round(value, round_to)
+                    for key, value in poll.items()}
+
 
 class Interfaces:
     """Non-INET interfaces and I/O on your agent, including lights and \
@@ -492,41 +970,7 @@ class Interfaces:
             """Reflect LED image vertically."""
             self.sense.flip_v()
 
-        # i am so sorry
-        def set_pixels(self, image:
-                       Tuple[Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int],
-                             Tuple[int, int, int], Tuple[int, int, int]]) -> \
-                None:
+        def set_pixels(self, image: PixelImage) -> None:
             """
             Set LED image using a tuple, with 64 elements, being tuples that \
                 represent the RGB value (0-255, 0-255, 0-255) of each pixel, \
@@ -534,74 +978,12 @@ class Interfaces:
                         value's position in the image tuple.
 
             :param image: tuple representing image to be rendered on LED matrix
-            :type image: Tuple[Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int]]
-            """
-            self.sense.set_pixels(list(map(list, image)))  # type: ignore
-
-        def get_pixels(self) -> \
-                Tuple[Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int],
-                      Tuple[int, int, int], Tuple[int, int, int]]:
+            :type image: PixelImage
+            """
+            # sense-hat only indexes and measures each pixel, tuples work
+            self.sense.set_pixels(image)  # type: ignore
+
+        def get_pixels(self) -> PixelImage:
             """
             Return LED image represented as a tuple, with 64 elements, being \
                 tuples that represent the RGB value (0-255, 0-255, 0-255) of \
@@ -609,38 +991,7 @@ class Interfaces:
                         corresponding RGB value's position in the image tuple.
 
             :return: tuple representing image rendered on LED matrix
-            :rtype: Tuple[Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int],
-                Tuple[int, int, int], Tuple[int, int, int]]
+            :rtype: PixelImage
             """
             return tuple(map(tuple, self.sense.get_pixels()))  # type: ignore
 
@@ -736,26 +1087,36 @@ class Power:
                 serial commands
             :type keymap: dict
             """
-            if isinstance(controller, Controllers.Serial) is True:
+            if isinstance(controller, Controllers.Serial):
                 self.controller = controller
             else:
                 raise ComponentError("Unsupported controller.")
             self.keymap: dict = keymap
+            self._collect: bytes = \
+                Controllers.encode_keymap(keymap)["COLLECT"]
 
-        def collect(self, round_to: Union[int, None]) -> Union[int, float]:
+        def collect(self, round_to: Union[int, None] = None) -> float:
             """
             Collect voltage data from sensor.
 
+            Raises ComponentError if the endpoint reply is not a number.
+
             :param round_to: decimal to round to, None to return raw, default
                 None
             :type round_to: Union[int, None]
             :return: sensor voltage
-            :rtype: Union[int, float]
+            :rtype: float
             """
-            self.controller.send(self.keymap["COLLECT"])
-            result = int(self.controller.receive())
+            self.controller.send(self._collect)
+            # the endpoint sends voltage with decimals, see generate
+            reply = self.controller.receive(return_bytes=True)
+            try:
+                result = float(reply)
+            except ValueError as parent_exception:
+                raise ComponentError("Voltage sensor sent a malformed reading"
+                                     ".") from parent_exception
             if round_to is not None:
-                round(result, round_to)
+                result = round(result, round_to)
             return result
 
     class Switch:
@@ -773,11 +1134,12 @@ class Power:
                 respective serial commands
             :type keymap: dict
             """
-            if isinstance(controller, Controllers.Serial) is True:
+            if isinstance(controller, Controllers.Serial):
                 self.controller = controller
             else:
                 raise ComponentError("Unsupported controller.")
             self.keymap: dict = keymap
+            self._commands: dict = Controllers.encode_keymap(keymap)
 
         def open(self) -> None:
             """
@@ -785,7 +1147,7 @@ class Power:
 
             :return: None
             """
-            self.controller.send(self.keymap["OPEN"])
+            self.controller.send(self._commands["OPEN"])
 
         def close(self) -> None:
             """
@@ -793,4 +1155,4 @@ class Power:
 
             :return: None
             """
-            self.controller.send(self.keymap["CLOSE"])
+            self.controller.send(self._commands["CLOSE"])
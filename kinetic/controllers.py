@@ -1,25 +1,72 @@
 """Module for controller abstractions to operate components."""
 
 from json import load as json_load
-from typing import Union, Literal
+from functools import lru_cache
+from typing import Union, Literal, Callable
 from threading import Lock
+from inspect import signature
 import serial
 from kinetic.exceptions import ControllerError
 
+try:
+    from sense_hat import SenseHat
+except ModuleNotFoundError:
+    SenseHat = None
+
+try:
+    # optional, faster JSON parsing for keymaps
+    from orjson import loads as orjson_loads
+except ModuleNotFoundError:
+    orjson_loads = None
+
 
 def load_keymap(path: str) -> dict:
     """
-    Load JSON keymap file with supplied path.
+    Load JSON keymap file with supplied path, parsed with orjson if it is \
+        installed.
+
+    Each path is read and parsed once per process, components sharing a \
+        keymap file get their own copy of the cached keymap.
 
     :param path: path to JSON keymap file
     :type path: str
     :return: keymap as dictionary
     :rtype: dict
     """
+    return dict(_parse_keymap(path))
+
+
+@lru_cache(maxsize=32)
+def _parse_keymap(path: str) -> dict:
+    """
+    Read and parse JSON keymap file, see load_keymap.
+
+    :param path: path to JSON keymap file
+    :type path: str
+    :return: keymap as dictionary, shared between callers
+    :rtype: dict
+    """
+    if orjson_loads is not None:
+        with open(path, "rb") as map_handler:
+            return orjson_loads(map_handler.read())
     with open(path) as map_handler:
         return json_load(map_handler)
 
 
+def encode_keymap(keymap: dict) -> dict:
+    """
+    Encode keymap commands to bytes, for components to keep and send \
+        without encoding on every call.
+
+    :param keymap: keymap with str commands, see load_keymap
+    :type keymap: dict
+    :return: keymap with the same keys and ASCII encoded commands
+    :rtype: dict
+    """
+    return {key: command.encode("ascii", "replace")
+            for key, command in keymap.items()}
+
+
 class Serial:
     """
     Abstraction class for a serial interface controller.
@@ -39,23 +86,47 @@ class Serial:
         :param timeout: timeout in seconds for serial port, default 5
         :type timeout: int
         """
-        self.LOOKUP: dict = {"SEND": self.send, "RECEIVE": self.receive}
         self.serial_instance: serial.Serial = serial.Serial(timeout=timeout)
         self.serial_instance.port = port
         self.serial_lock: Lock = Lock()
+        # run after the port is reopened, see Serial.add_open_callback
+        self._open_callbacks: list = []
         try:
+            self.serial_instance.open()
+        except serial.SerialException as parent_exception:
+            raise ControllerError("Failed to initialize serial controller.") \
+                from parent_exception
+
+    def add_open_callback(self, callback: Callable[[], None]) -> None:
+        """
+        Register a function to be called whenever Serial.reopen opens the \
+            port again.
+
+        Opening the port resets most Arduino boards, components caching \
+            state held by the endpoint use this to send it again.
+
+        :param callback: function taking no parameters
+        :type callback: Callable[[], None]
+        """
+        self._open_callbacks.append(callback)
+
+    def reopen(self) -> None:
+        """
+        Close and open the serial port again, for example after the \
+            endpoint was unplugged or stopped responding.
+
+        Functions registered with Serial.add_open_callback are called once \
+            the port is open.
+        """
+        with self.serial_lock:
+            self.serial_instance.close()
             try:
                 self.serial_instance.open()
-            except serial.serialposix.SerialException as parent_exception:
-                raise ControllerError("Failed to initialize serial controller"
-                                      ".") from parent_exception
-        except AttributeError:
-            # compatibility for Windows tests, this is an extremely dirty bodge
-            try:
-                self.serial_instance.open()
-            except serial.serialwin32.SerialException as parent_exception:
-                raise ControllerError("Failed to initialize serial controller"
-                                      ".") from parent_exception
+            except serial.SerialException as parent_exception:
+                raise ControllerError("Failed to reopen serial controller.") \
+                    from parent_exception
+        for callback in self._open_callbacks:
+            callback()
 
     def send(self, message: Union[str, bytes],
              chain_call: Union[Literal["SEND", "RECEIVE"], None] = None,
@@ -79,37 +150,60 @@ class Serial:
         """
         if isinstance(message, str):
             message = message.encode("ascii", "replace")
-        if in_recursion is not True:
-            self.serial_lock.acquire()
+        if in_recursion:
+            return self._send(message, chain_call, chain_call_parameters)
+        with self.serial_lock:
+            return self._send(message, chain_call, chain_call_parameters)
+
+    def _send(self, message: bytes,
+              chain_call: Union[Literal["SEND", "RECEIVE"], None],
+              chain_call_parameters: Union[tuple, dict, None]) -> None:
+        """
+        Write message to serial and run chain call, caller holds \
+            self.serial_lock, see Serial.send.
+
+        :param message: data to be sent, encoded
+        :type message: bytes
+        :param chain_call: see Serial.send
+        :type chain_call: Union[Literal["SEND", "RECEIVE"], None]
+        :param chain_call_parameters: see Serial.send
+        :type chain_call_parameters: Union[tuple, dict, None]
+        """
         try:
-            for index, _ in enumerate(message):
-                self.serial_instance.write(message[index])
-            self.serial_instance.write(b"\x0A")
-            if chain_call is not None and chain_call_parameters is not None:
-                if isinstance(chain_call_parameters, list):
-                    if chain_call_parameters[3] is not True:
-                        # minor tuple mutability hack
-                        chain_call_parameters = list(chain_call_parameters)
-                        chain_call_parameters[3] = True
-                        chain_call_parameters = tuple(chain_call_parameters)
-                    return self.LOOKUP[
-                        chain_call.upper()](*chain_call_parameters)
-                if isinstance(chain_call_parameters, dict):
-                    chain_call_parameters["in_recursion"] = True
-                    return Serial.LOOKUP[chain_call.upper()](
-                        **chain_call_parameters)
-        except serial.serialposix.SerialException as parent_exception:
+            self.serial_instance.write(message + b"\x0A")
+            if chain_call is None or chain_call_parameters is None:
+                return None
+            return self._chain(chain_call, chain_call_parameters)
+        except serial.SerialException as parent_exception:
             raise ControllerError("Serial controller failed to send bytes.") \
                 from parent_exception
-        except KeyError as parent_exception:
-            raise ControllerError("Invalid chain call.") from parent_exception
-        finally:
-            self.serial_lock.release()
+
+    def send_batch(self, *messages: Union[str, bytes]) -> None:
+        """
+        Send several messages through serial in a single write.
+
+        Each message is newline-terminated as with Serial.send, the endpoint \
+            parses them as consecutive commands. Messages are written whole \
+                under self.serial_lock, other threads cannot interleave.
+
+        :param messages: data to be sent, in order
+        :type messages: Union[str, bytes]
+        """
+        frame = b"\x0A".join(
+            message.encode("ascii", "replace") if isinstance(message, str)
+            else message for message in messages) + b"\x0A"
+        with self.serial_lock:
+            try:
+                self.serial_instance.write(frame)
+            except serial.SerialException as parent_exception:
+                raise ControllerError("Serial controller failed to send "
+                                      "bytes.") from parent_exception
 
     def receive(self,
                 chain_call: Union[Literal["SEND", "RECEIVE"], None] = None,
                 chain_call_parameters: Union[tuple, dict, None] = None,
-                in_recursion: bool = False) -> str:
+                in_recursion: bool = False,
+                return_bytes: bool = False) -> Union[str, bytes]:
         """
         Receives bytes through serial.
 
@@ -123,34 +217,81 @@ class Serial:
         :param in_recursion: if True function call ignores self.serial_lock,
             should not be True unless triggered by chain call, default False
         :type in_recursion: bool
-        :return: str, decoded byte string
+        :param return_bytes: if True response is returned undecoded as bytes,
+            for callers that parse it directly, default False
+        :type return_bytes: bool
+        :return: Union[str, bytes], decoded byte string, or bytes if
+            return_bytes is True
+        """
+        if in_recursion:
+            return self._receive(chain_call, chain_call_parameters,
+                                 return_bytes)
+        with self.serial_lock:
+            return self._receive(chain_call, chain_call_parameters,
+                                 return_bytes)
+
+    def _receive(self, chain_call: Union[Literal["SEND", "RECEIVE"], None],
+                 chain_call_parameters: Union[tuple, dict, None],
+                 return_bytes: bool) -> Union[str, bytes]:
+        """
+        Read a line from serial and run chain call, caller holds \
+            self.serial_lock, see Serial.receive.
+
+        :param chain_call: see Serial.receive
+        :type chain_call: Union[Literal["SEND", "RECEIVE"], None]
+        :param chain_call_parameters: see Serial.receive
+        :type chain_call_parameters: Union[tuple, dict, None]
+        :param return_bytes: see Serial.receive
+        :type return_bytes: bool
+        :return: Union[str, bytes], see Serial.receive
         """
-        if in_recursion is not True:
-            self.serial_lock.acquire()
         try:
-            response = self.serial_instance.read_until(b"\x0A").rstrip(b"\n").\
-                decode("utf-8", "replace")
+            response = self.serial_instance.read_until(b"\x0A").rstrip(b"\n")
+            if not return_bytes:
+                response = response.decode("utf-8", "replace")
             if chain_call is not None and chain_call_parameters is not None:
-                if isinstance(chain_call_parameters, list):
-                    if chain_call_parameters[3] is not True:
-                        # minor tuple mutability hack
-                        chain_call_parameters = list(chain_call_parameters)
-                        chain_call_parameters[3] = True
-                        chain_call_parameters = tuple(chain_call_parameters)
-                    Serial.LOOKUP[chain_call.upper()](*chain_call_parameters)
-                    return response
-                if isinstance(chain_call_parameters, dict):
-                    chain_call_parameters["in_recursion"] = True
-                    self.LOOKUP[chain_call.upper()](**chain_call_parameters)
-                    return response
+                self._chain(chain_call, chain_call_parameters)
             return response
-        except serial.serialposix.SerialException as parent_exception:
+        except serial.SerialException as parent_exception:
             raise ControllerError("Serial controller failed to receive bytes"
                                   ".") from parent_exception
-        except KeyError as parent_exception:
+
+    def _chain(self, chain_call: Literal["SEND", "RECEIVE"],
+               chain_call_parameters: Union[tuple, dict]):
+        """
+        Run chain call with in_recursion set, under the lock held by the \
+            outermost call.
+
+        :param chain_call: see Serial.send
+        :type chain_call: Literal["SEND", "RECEIVE"]
+        :param chain_call_parameters: see Serial.send
+        :type chain_call_parameters: Union[tuple, dict]
+        :return: return value of chain call
+        """
+        chain_call = chain_call.upper()
+        if chain_call == "SEND":
+            target = self.send
+        elif chain_call == "RECEIVE":
+            target = self.receive
+        else:
+            raise ControllerError("Invalid chain call.")
+        try:
+            if isinstance(chain_call_parameters, dict):
+                parameters = {**chain_call_parameters, "in_recursion": True}
+            else:
+                # positional parameters are bound to names, so in_recursion
+                # is set wherever it falls in the signature
+                parameters = Serial._CHAIN_SIGNATURES[chain_call].bind(
+                    self, *chain_call_parameters).arguments
+                del parameters["self"]
+                parameters["in_recursion"] = True
+        except TypeError as parent_exception:
             raise ControllerError("Invalid chain call.") from parent_exception
-        finally:
-            self.serial_lock.release()
+        return target(**parameters)
+
+    # signatures for binding positional chain call parameters
+    _CHAIN_SIGNATURES: dict = {"SEND": signature(send),
+                               "RECEIVE": signature(receive)}
 
 
 class SenseHAT:
@@ -164,12 +305,9 @@ class SenseHAT:
             installed.
         See https://pythonhosted.org/sense-hat/ for more information.
         """
-        try:
-            # pylint: disable=import-outside-toplevel
-            from sense_hat import SenseHat
-        except ModuleNotFoundError as parent_exception:
+        if SenseHat is None:
             raise ControllerError("SenseHAT controller was initialized without"
-                                  " pre-requisites.") from parent_exception
+                                  " pre-requisites.")
         self.sense = SenseHat()
         self.sense.set_imu_config(True, True, True)
 
@@ -12,51 +12,18 @@ Project KINETIC, generate.py module, generates serial endpoints from given \
 Made by perpetualCreations
 """
 
+
 # Imports
 
 import argparse
-import inspect
 import configparser
 import sys
-from os.path import split, splitext, join
-from typing import List
-from json import dump
+from os.path import split, splitext, join, dirname, abspath
+from json import dumps
+from collections import defaultdict
+from importlib import import_module
 from time import time
-import kinetic
-
-init_time = time()
-
-# Argument Configuration
-argument_parser = argparse.ArgumentParser()
-argument_parser.add_argument(
-    "configpath", help="Path to generation configuration.", type=str)
-args = argument_parser.parse_args()
-
-# Parameter Retrieval
-configuration_parser = configparser.ConfigParser()
-configuration_parser.read(args.configpath)
-
-# Initial Preparation of End-User Agent Module
-sys.path.append(split(configuration_parser["path"]["script_path"])[0])
-# placeholder, so PyCharm knows this exists, overwritten by exec import below
-target = None
-exec("from " + splitext(split(
-    configuration_parser["path"]["script_path"])[1])[0] + " import " +
-     configuration_parser["class"]["agent_class"] + " as target")
-
-# Defining Script Variables
-components = []  # empty list to be appended to by component indexing
-# components list but elements only contain the bases,
-# and contain only one of each type
-components_set = []
-# list of valid component classes that have serial endpoint as a valid
-# controller
-components_valid = [kinetic.Components.Kinetics.Motor,
-                    kinetic.Components.Sensors.VL53L0X,
-                    kinetic.Components.Power.VoltageSensor,
-                    kinetic.Components.Power.Switch,
-                    kinetic.Components.Generic
-                    ]
+
 # this is a kluge, and could be automated,
 # but I want to get a commit done by today
 # 3-11 -> Uno/Nano/Mini, 2-12 and 44-46 -> Extended Mega
@@ -67,311 +34,196 @@ normal_digital_pin_reference = [2]
 # irregular frequency of 980 Hz
 normal_digital_pin_reference += list(range(4, 7)) + list(range(13, 44)) + list(
     range(47, 54))
-# integer variables that progress the index head with every assignment
-# could be upgraded to a more elegant solution
-pin_index = {"PWM": 0, "DIGITAL": 0, "ANALOG": 0}
-generic_index = 0
-
-# Component Collection of End-User Agent Module
-# target is imported on line 39 with exec()
-for head in inspect.getmembers(target):
-    for neck in head:
-        try:
-            if neck.__bases__[0] in components_valid:
-                components.append(
-                    {"ORIGIN": neck, "COMPONENT": neck.__bases__[0]})
-                components_set.append(neck.__bases__[0])
-        except AttributeError:
-            # not all items in head have attribute __bases__
-            # (only the derived class will)
-            pass
-
-if not components:
-    raise Exception("Could not find Agent/Component inherited classes.")
-
-
-# Define Filtering Function
-def mono_type_component_filter(component_type) -> list:
-    """
-    Filter component list for a single component type in components_valid.
+# A0-A15 on the Mega, fewer on smaller boards
+analog_pin_reference = list(range(16))
+# free pins of each kind, consumed in order by assign_pin
+pin_pools = {"PWM": iter(pwm_pin_reference),
+             "DIGITAL": iter(normal_digital_pin_reference),
+             "ANALOG": iter(analog_pin_reference)}
 
-    Returns all dictionary elements with the given component type as a list.
+# Command Dispatch
+# hashes of commands emitted so far, for catching collisions
+dispatch_hashes = {}
 
-    :param component_type: component type to filter for
-    :return: filtered components, can be empty if no component exists of type
-    :rtype: list
+
+def fnv1a(command: str) -> int:
     """
-    result = []  # appended to for each valid element
-    for items in components:
-        if items["COMPONENT"] == component_type:
-            result.append(items)
-    return result
+    Hash command with 32-bit FNV-1a, matching accumulatorHash in the \
+        generated C++.
 
+    :param command: serial command
+    :type command: str
+    :return: hash of command
+    :rtype: int
+    """
+    result = 2166136261
+    for byte in command.encode("ascii"):
+        result = ((result ^ byte) * 16777619) & 0xFFFFFFFF
+    return result
 
-# Pin Assignment
-# thanks to Python scope referencing, edits made to elements in the list
-# returned by the filter function are not applied to the main component list.
-# solution? more lists. these get appended to with the new dictionary entries
-# containing pin assignments
-motors: List[kinetic.Components.Kinetics.Motor] = []
-voltage_sensors: List[kinetic.Components.Power.VoltageSensor] = []
-switches: List[kinetic.Components.Power.Switch] = []
-for motor in mono_type_component_filter(kinetic.Components.Kinetics.Motor):
-    if motor["ORIGIN"].pwm is True:
-        motor.update({"PWM": pwm_pin_reference[pin_index["PWM"]]})
-        pin_index["PWM"] += 1
-    else:
-        motor.update({"PWM": None})
-    if motor["ORIGIN"].direction is True:
-        motor.update(
-            {"DIR": normal_digital_pin_reference[pin_index["DIGITAL"]]})
-        pin_index["DIGITAL"] += 1
-    else:
-        motor.update({"DIR": None})
-    motor.update({"BRAKE": normal_digital_pin_reference[pin_index["DIGITAL"]]})
-    pin_index["DIGITAL"] += 1
-    motors.append(motor)
-for voltage_sensor in mono_type_component_filter(
-        kinetic.Components.Power.VoltageSensor):
-    voltage_sensor.update({"COLLECT": pin_index["ANALOG"]})
-    pin_index["ANALOG"] += 1
-    voltage_sensors.append(voltage_sensor)
-for switch in mono_type_component_filter(kinetic.Components.Power.Switch):
-    switch.update(
-        {"CONTROL": normal_digital_pin_reference[pin_index["DIGITAL"]]})
-    pin_index["DIGITAL"] += 1
-
-# Write Script from Preliminary Details
-with open(join(configuration_parser["path"]["output_path"],
-               "kinetic_serial_endpoint.cpp"), "w") as script_export:
-    script = """// KINETIC Serial Endpoint Code Generation
-// Auto-Generated
-
-// See documentation on pinouts and additional information.
-
-#include <Arduino.h>
-"""
 
-    if kinetic.Components.Sensors.VL53L0X in components_set:
-        script += """
-#include <Wire.h>
-#include <VL53L0X.h>
-"""
+def dispatch_case(command: str) -> str:
+    """
+    Return C++ switch case label dispatching command, by its FNV-1a hash.
 
-    for vl53l0x_sensor in mono_type_component_filter(
-            kinetic.Components.Sensors.VL53L0X):
-        script += "\nVL53L0X " + vl53l0x_sensor["ORIGIN"].__name__ + ";"
+    Raises an exception if command collides with an earlier command.
 
-    script += """
-int incomingData;
-int accumulatorIndex = 0;
-char accumulator[64];
-"""
+    :param command: serial command
+    :type command: str
+    :return: case label, commented with command
+    :rtype: str
+    """
+    command_hash = fnv1a(command)
+    if dispatch_hashes.setdefault(command_hash, command) != command:
+        raise Exception("Commands " + dispatch_hashes[command_hash] + " and "
+                        + command + " have the same hash, rename either "
+                        "component.")
+    return "case " + hex(command_hash) + "UL: // " + command
 
-    for motor in motors:
-        if motor["PWM"] is not None:
-            script += "\nbool motorIsReadingSpeed" + motor["ORIGIN"].__name__ \
-                + " = false;"
-
-    if kinetic.Components.Power.VoltageSensor in components_set:
-        script += """
-static float voltage_get(int pin) {
-    float raw = analogRead(pin);
-    return ((raw * 5.0000000) / 1024.000000) / (7.50/37.50);
-}
-"""
 
-    if kinetic.Components.Sensors.VL53L0X in components_set:
-        script += """
-static distance_dump(VL53L0X sensor) {
-    Serial.print(sensor.readRangeSingleMillimeters());
-    if (sensor.timeoutOccurred()) {
-        Serial.write("TIMEOUT");
-    }
-    Serial.write("\n");
-}
-"""
+def assign_pin(pool: str) -> int:
+    """
+    Take the next free pin from a pin pool.
 
-    script += """
-void setup() {
-    Serial.begin(9600);
-"""
+    Raises an exception if the pool has no pins left.
 
+    :param pool: PWM, DIGITAL, or ANALOG
+    :type pool: str
+    :return: pin number
+    :rtype: int
+    """
+    try:
+        return next(pin_pools[pool])
+    except StopIteration:
+        raise Exception("Ran out of " + pool + " pins to assign, the agent "
+                        "has too many components for the board.") from None
+
+
+def main() -> None:
+    """Generate serial endpoint and keymaps, see configpath argument."""
+    init_time = time()
+
+    # Argument Configuration
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument(
+        "configpath", help="Path to generation configuration.", type=str)
+    args = argument_parser.parse_args()
+
+    # imported once arguments are valid, so usage errors and --help return
+    # without loading kinetic and its dependencies
+    import kinetic
+    from jinja2 import Environment, FileSystemLoader
+
+    # Parameter Retrieval
+    # values are plain paths and names, read verbatim without % interpolation
+    configuration_parser = configparser.ConfigParser(interpolation=None)
+    configuration_parser.read(args.configpath)
+
+    # Initial Preparation of End-User Agent Module
+    sys.path.append(split(configuration_parser["path"]["script_path"])[0])
+    target = getattr(import_module(splitext(split(
+        configuration_parser["path"]["script_path"])[1])[0]),
+                     configuration_parser["class"]["agent_class"])
+
+    # Defining Script Variables
+    components = []  # empty list to be appended to by component indexing
+    # valid component classes that have serial endpoint as a valid controller
+    components_valid_set = frozenset([kinetic.Components.Kinetics.Motor,
+                                      kinetic.Components.Sensors.VL53L0X,
+                                      kinetic.Components.Power.VoltageSensor,
+                                      kinetic.Components.Power.Switch,
+                                      kinetic.Components.Generic])
+
+    # Component Collection of End-User Agent Module
+    # attributes are merged down the MRO so inherited components are found,
+    # and sorted by name, pins are assigned in that order
+    members = {}
+    for base in reversed(target.__mro__):
+        members.update(vars(base))
+    for _, member in sorted(members.items()):
+        if not isinstance(member, type):
+            continue
+        base = member.__bases__[0]
+        if base in components_valid_set:
+            components.append({"ORIGIN": member, "COMPONENT": base,
+                               "NAME": member.__name__})
+
+    if not components:
+        raise Exception("Could not find Agent/Component inherited classes.")
+
+    # components bucketed by component type in one pass, types without
+    # components give an empty list
+    components_by_type = defaultdict(list)
+    for item in components:
+        components_by_type[item["COMPONENT"]].append(item)
+    motors = components_by_type[kinetic.Components.Kinetics.Motor]
+    vl53l0x_sensors = components_by_type[kinetic.Components.Sensors.VL53L0X]
+    voltage_sensors = components_by_type[
+        kinetic.Components.Power.VoltageSensor]
+    switches = components_by_type[kinetic.Components.Power.Switch]
+
+    # Pin Assignment
+    # pin assignments are written into the bucketed dictionary entries in
+    # place
     for motor in motors:
-        if motor["PWM"] is not None:
-            script += "\n    pinMode(" + str(motor["PWM"]) + \
-                ", OUTPUT); // PWM CONTROL FOR " + motor["ORIGIN"].__name__
-        if motor["DIR"] is not None:
-            script += "\n    pinMode(" + str(motor["DIR"]) + \
-                ", OUTPUT); // DIRECTION CONTROL FOR " + \
-                      motor["ORIGIN"].__name__
-        script += "\n    pinMode(" + str(motor["BRAKE"]) + \
-            ", OUTPUT); // BRAKE CONTROL FOR " + motor["ORIGIN"].__name__
-
-    for switch in switches:
-        script += "\n    pinMode(" + str(switch["CONTROL"]) + \
-            ", OUTPUT); // SWITCH CONTROL FOR " + switch["ORIGIN"].__name__
-
-    for vl53l0x_sensor in mono_type_component_filter(
-            kinetic.Components.Sensors.VL53L0X):
-        script += "\n" + vl53l0x_sensor["ORIGIN"].__name__ + \
-            ".setTimeout(500);"
-        script += "\n" + vl53l0x_sensor["ORIGIN"].__name__ + ".init();"
-
-    script += "\n}\n"
-
-    script += """
-void loop() {
-"""
-
-    # TODO reimplement voltage sensor checks on init for battery
-
-    script += """
-    if (Serial.available() > 0) {
-
-        incomingData = Serial.read();
-
-        // 0x0A is the decimal code for a newline character,
-        // when it's received, the accumulator is dumped and evaluated
-        if (incomingData == 0x0A) {
-            accumulatorIndex = 0; // reset accumulator write index"""
-
-    # prepare yourselves for some **brain damage**!!!
-    # problems:
-    # 1. component generation is depressing
-    # 2. component generation is depressing
-    # 3. component generation is depressing
-    # 4. also haha if statement spam go brr
-    # what could be done instead:
-    # 1. load commands as templates from file,
-    #  (use Jinja to apply variables to template)
-    # 2. use switch statements in C++ code
-    # dear all end users who see this, god help you.
-    # TODO will fix in next commit.
-
-    for voltage_sensor in voltage_sensors:  # TODO fix voltage decimal length
-        script += '''\n            if (strcmp(accumulator, "''' + \
-            "VOLTAGE_SENSOR_COLLECT " + voltage_sensor["ORIGIN"].__name__ + \
-            '''") == 0) {'''
-        script += "\n                static char converted_voltage[5];"
-        script += "\n                dtostrf(voltage_get(" + str(
-            voltage_sensor["COLLECT"]) + "), 5, 3, converted_voltage);"
-        script += "\n                Serial.write(converted_voltage);"
-        script += "\n                Serial.write(\\n);"
-        script += "\n            }"
-
+        motor["PWM"] = assign_pin("PWM") if motor["ORIGIN"].pwm else None
+        motor["DIR"] = assign_pin("DIGITAL") if motor["ORIGIN"].direction \
+            else None
+        motor["BRAKE"] = assign_pin("DIGITAL")
+    for voltage_sensor in voltage_sensors:
+        voltage_sensor["COLLECT"] = assign_pin("ANALOG")
     for switch in switches:
-        script += '''\n            if (strcmp(accumulator, "''' + \
-            "SWITCH_OPEN " + switch["ORIGIN"].__name__ + '''") == 0) {'''
-        script += "\n                digitalWrite(" + str(switch["CONTROL"]) \
-            + ", LOW);"
-        script += "\n            }"
-        script += '''\n            if (strcmp(accumulator, "''' + \
-            "SWITCH_CLOSE " + switch["ORIGIN"].__name__ + '''") == 0) {'''
-        script += "\n                digitalWrite(" + str(switch["CONTROL"]) \
-            + ", HIGH);"
-        script += "\n            }"
-
-    for motor in motors:
-        script += '''\n            if (strcmp(accumulator, "''' + \
-            "MOTOR_BRAKE_HOLD " + motor["ORIGIN"].__name__ + '''") == 0) {'''
-        script += "\n                digitalWrite(" + str(motor["BRAKE"]) + \
-            ", HIGH);"
-        script += "\n            }"
-        script += '''\n            if (strcmp(accumulator, "''' + \
-            "MOTOR_BRAKE_RELEASE " + motor["ORIGIN"].__name__ + \
-            '''") == 0) {'''
-        script += "\n                digitalWrite(" + str(motor["BRAKE"]) + \
-            ", LOW);"
-        script += "\n            }"
-        if motor["DIR"] is not None:
-            script += '''\n            if (strcmp(accumulator, "''' + \
-                "MOTOR_FORWARD " + motor["ORIGIN"].__name__ + '''") == 0) {'''
-            script += "\n                digitalWrite(" + str(motor["DIR"]) + \
-                ", HIGH);"
-            script += "\n            }"
-            script += '''\n            if (strcmp(accumulator, "''' + \
-                "MOTOR_BACKWARD " + motor["ORIGIN"].__name__ + '''") == 0) {'''
-            script += "\n                digitalWrite(" + str(motor["DIR"]) + \
-                ", LOW);"
-            script += "\n            }"
-        if motor["PWM"] is not None:
-            script += '''\n            if (strcmp(accumulator, "''' + \
-                "MOTOR_SPEED " + motor["ORIGIN"].__name__ + '''") == 0) {'''
-            script += "\n                motorIsReadingSpeed" + \
-                motor["ORIGIN"].__name__ + " = true;"
-            script += "\n            }"
-            script += "\n            if (motorIsReadingSpeed" + \
-                motor["ORIGIN"].__name__ + " == true) {"
-            script += "\n                analogWrite(" + str(motor["PWM"]) + \
-                ", atoi(accumulator));"
-            script += "\n                motorIsReadingSpeed" + \
-                motor["ORIGIN"].__name__ + " = false;"
-            script += "\n            }"
-
-    for vl53l0x_sensor in mono_type_component_filter(
-            kinetic.Components.Sensors.VL53L0X):
-        script += '''\n            if (strcmp(accumulator, "''' + \
-            "VL53L0X_COLLECT " + vl53l0x_sensor["ORIGIN"].__name__ + \
-            '''") == 0) {'''
-        script += "\n                distance_dump(" + \
-            vl53l0x_sensor["ORIGIN"].__name__ + ");"
-        script += "\n            }"
-
-    for generic in mono_type_component_filter(kinetic.Components.Generic):
-        if generic.generate_ignore is False:
-            script += '''\n            if (strcmp(accumulator, "''' + \
-                "REPLACE_ME_GENERIC_COMMAND " + generic["ORIGIN"].__name__ + \
-                '''") == 0) {'''
-            script += "\n                // insert command logic here"
-            script += "\n            }"
-
-    script += """
-
-            memset(accumulator, 0, sizeof(accumulator)); // clears array.
-        }
-        else {
-            if (accumulatorIndex <= 63) {
-                accumulator[accumulatorIndex] = incomingData;
-                accumulatorIndex += 1;
-            }
-        }
-    }
-}
-    """
-    script_export.write(script)
+        switch["CONTROL"] = assign_pin("DIGITAL")
+
+    # Write Script from Preliminary Details
+    # see templates/kinetic_serial_endpoint.cpp.j2
+    template_environment = Environment(
+        loader=FileSystemLoader(join(dirname(abspath(__file__)), "templates")),
+        trim_blocks=True, lstrip_blocks=True, keep_trailing_newline=True)
+    with open(join(configuration_parser["path"]["output_path"],
+                   "kinetic_serial_endpoint.cpp"), "w") as script_export:
+        # streamed to the file as it renders, rather than built whole first
+        template_environment.get_template(
+            "kinetic_serial_endpoint.cpp.j2").stream(
+                motors=motors, switches=switches,
+                voltage_sensors=voltage_sensors,
+                vl53l0x_sensors=vl53l0x_sensors,
+                generics=[generic for generic in
+                          components_by_type[kinetic.Components.Generic]
+                          if not getattr(generic["ORIGIN"], "generate_ignore",
+                                         False)],
+                case=dispatch_case).dump(script_export)
+
+    # Write Keymaps
+    # file name prefix and keymap of every component, written in one pass
+    keymaps = []
     for motor in motors:
-        with open(
-                join(configuration_parser["path"]["output_path"], "motor_" +
-                     motor["ORIGIN"].__name__ + "_keymap.json"),
-                "w") as json_dump_handle:
-            dump({"FORWARDS": "MOTOR_FORWARD " + motor["ORIGIN"].__name__,
-                  "BACKWARDS": "MOTOR_BACKWARD " + motor["ORIGIN"].__name__,
-                  "SPEED": "MOTOR_SPEED " + motor["ORIGIN"].__name__,
-                  "BRAKE": "MOTOR_BRAKE_HOLD " + motor["ORIGIN"].__name__,
-                  "RELEASE": "MOTOR_BRAKE_RELEASE " + motor["ORIGIN"].__name__
-                  }, json_dump_handle)
-    for vl53l0x_sensor in mono_type_component_filter(
-            kinetic.Components.Sensors.VL53L0X):
-        with open(join(configuration_parser["path"]["output_path"],
-                       "vl53l0x_" + vl53l0x_sensor["ORIGIN"].__name__ +
-                       "_keymap.json"), "w") as json_dump_handle:
-            dump({"COLLECT": "VL53L0X_COLLECT " +
-                  vl53l0x_sensor["ORIGIN"].__name__, }, json_dump_handle)
+        name = motor["NAME"]
+        keymaps.append(("motor_" + name, {
+            "FORWARDS": "MOTOR_FORWARD " + name,
+            "BACKWARDS": "MOTOR_BACKWARD " + name,
+            "SPEED": "MOTOR_SPEED " + name,
+            "BRAKE": "MOTOR_BRAKE_HOLD " + name,
+            "RELEASE": "MOTOR_BRAKE_RELEASE " + name}))
+    for vl53l0x_sensor in vl53l0x_sensors:
+        name = vl53l0x_sensor["NAME"]
+        keymaps.append(("vl53l0x_" + name,
+                        {"COLLECT": "VL53L0X_COLLECT " + name}))
     for voltage_sensor in voltage_sensors:
-        with open(join(configuration_parser["path"]["output_path"],
-                       "voltage_sensor_" +
-                       voltage_sensor["ORIGIN"].__name__ + "_keymap.json"),
-                  "w") as json_dump_handle:
-            dump({"COLLECT": "VOLTAGE_SENSOR_COLLECT " +
-                  voltage_sensor["ORIGIN"].__name__, }, json_dump_handle)
+        name = voltage_sensor["NAME"]
+        keymaps.append(("voltage_sensor_" + name,
+                        {"COLLECT": "VOLTAGE_SENSOR_COLLECT " + name}))
     for switch in switches:
+        name = switch["NAME"]
+        keymaps.append(("switch_" + name, {"OPEN": "SWITCH_OPEN " + name,
+                                           "CLOSE": "SWITCH_CLOSE " + name}))
+    for prefix, keymap in keymaps:
         with open(join(configuration_parser["path"]["output_path"],
-                       "switch_" + switch["ORIGIN"].__name__ + "_keymap.json"),
-                  "w") as json_dump_handle:
-            dump({"OPEN": "SWITCH_OPEN " + switch["ORIGIN"].__name__,
-                  "CLOSE": "SWITCH_CLOSE " + switch["ORIGIN"].__name__,
-                  }, json_dump_handle)
-pass
-
-print("Done, task completed in ", time() - init_time, " seconds.")
+                       prefix + "_keymap.json"), "w") as json_dump_handle:
+            json_dump_handle.write(dumps(keymap, separators=(",", ":")))
+
+    print("Done, task completed in ", time() - init_time, " seconds.")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,8 +28,9 @@ setuptools.setup(
     url="https://github.com/perpetualCreations/kinetic/",
     install_requires=["swbs > 1.2", "pyserial", "numpy",
                       "opencv-contrib-python", "imutils", "sense-hat",
-                      "gpiozero"],
+                      "gpiozero", "jinja2"],
     packages=setuptools.find_packages(),
+    package_data={"kinetic": ["templates/*.j2"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -14,14 +14,19 @@ Made by perpetualCreations
 
 import swbs
 import cv2
-import numpy
+import kinetic
 
 if __name__ == '__main__':
     host = swbs.Host(999, None)
     host.listen()
     while True:
         # print(MD5.new(host.receive(500000, return_bytes = True)).hexdigest())
-        image = cv2.imdecode(numpy.frombuffer(host.receive(
-            500000, return_bytes=True), numpy.uint8), cv2.IMREAD_COLOR)
+        # decoded straight from the received bytes, without an array copy
+        try:
+            image = kinetic.Components.Sensors.USBCamera.decode_frame(
+                host.receive(500000, return_bytes=True))
+        except kinetic.Exceptions.ComponentError:
+            # a truncated frame is dropped, the next one replaces it
+            continue
         cv2.imshow("unit test", image)
         cv2.waitKey(1)
@@ -65,8 +65,8 @@ class TestBot(kinetic.Agent):
                 outer_self.serial,
                 kinetic.Controllers.load_keymap(
                     "F://KINETIC//tests//motor_MotorRight_keymap.json"))
-            TestBot.MotorLeft.pwm = self.is_pwm_enabled
-            TestBot.MotorLeft.direction = self.is_direction_enabled
+            TestBot.MotorRight.pwm = self.is_pwm_enabled
+            TestBot.MotorRight.direction = self.is_direction_enabled
 
     class MotorBind(kinetic.ActionGroups.DualMotor):
         """Dual motor action group."""